@@ -6,19 +6,20 @@ from pathlib import Path
 from typing import Optional
 
 import typer
-from apscheduler.triggers.cron import CronTrigger
 from rich.console import Console
-from rich.table import Table
 
 from .config import APP_NAME, default_data_dir, ensure_data_dir
 from .db import Database
-from .runner import run_task
-from .scheduler_service import run_scheduler_loop
-from .updater import UpdateError, default_repository_root, update_repository
+
+# Heavy dependencies (APScheduler, rich tables, the runner/scheduler/updater
+# modules) are imported inside the commands that need them, so e.g.
+# `script-manager --help` or `list` does not pay their import cost.
 
 console = Console()
 app = typer.Typer(help="Zarzadzanie harmonogramem uruchamiania skryptow Python.")
 
+_TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
 
 def _resolve_data_dir(custom: Optional[Path]) -> Path:
     if custom:
@@ -43,10 +44,14 @@ def main(
     ),
 ) -> None:
     data_dir_resolved = _resolve_data_dir(data_dir)
+    database = _get_database(data_dir_resolved)
     ctx.obj = {
         "data_dir": data_dir_resolved,
-        "db": _get_database(data_dir_resolved),
+        "db": database,
     }
+    # Close the connection when the command finishes so PRAGMA optimize
+    # gets a chance to refresh planner statistics.
+    ctx.call_on_close(database.close)
     console.print(f"[green]{APP_NAME} bedzie korzystal z katalogu: {data_dir_resolved}[/green]")
 
 
@@ -69,6 +74,8 @@ def add_task(
 ) -> None:
     """Dodaj nowe zadanie."""
 
+    from apscheduler.triggers.cron import CronTrigger
+
     database: Database = ctx.obj["db"]
     script_path = script.expanduser().resolve()
     if not script_path.exists():
@@ -92,13 +99,17 @@ def add_task(
         typer.echo(f"Blad: katalog roboczy {working_directory} nie istnieje.")
         raise typer.Exit(code=1)
 
-    task = database.add_task(
-        name=name,
-        script_path=script_path,
-        cron=cron,
-        python_executable=python_exec,
-        working_directory=working_directory,
-    )
+    try:
+        task = database.add_task(
+            name=name,
+            script_path=script_path,
+            cron=cron,
+            python_executable=python_exec,
+            working_directory=working_directory,
+        )
+    except ValueError:
+        typer.echo(f"Blad: zadanie o nazwie '{name}' juz istnieje.")
+        raise typer.Exit(code=1)
     console.print(f"[green]Dodano zadanie '{task.name}'.[/green]")
 
 
@@ -106,6 +117,8 @@ def add_task(
 def list_tasks(ctx: typer.Context) -> None:
     """Wyswietl wszystkie zadania."""
 
+    from rich.table import Table
+
     database: Database = ctx.obj["db"]
     tasks = database.list_tasks()
     if not tasks:
@@ -127,7 +140,7 @@ def list_tasks(ctx: typer.Context) -> None:
             task.cron,
             str(task.python_executable) if task.python_executable else sys.executable,
             str(task.working_directory) if task.working_directory else "-",
-            task.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+            task.created_at_display or task.created_at.strftime(_TS_FORMAT),
         )
 
     console.print(table)
@@ -152,6 +165,8 @@ def show_runs(
 ) -> None:
     """Pokaz ostatnie uruchomienia."""
 
+    from rich.table import Table
+
     database: Database = ctx.obj["db"]
     runs = database.recent_runs(limit=limit, task_name=name)
     if not runs:
@@ -174,8 +189,9 @@ def show_runs(
         table.add_row(
             str(run.id),
             task_label,
-            run.started_at.strftime("%Y-%m-%d %H:%M:%S"),
-            run.finished_at.strftime("%Y-%m-%d %H:%M:%S") if run.finished_at else "-",
+            run.started_at_display or run.started_at.strftime(_TS_FORMAT),
+            run.finished_at_display
+            or (run.finished_at.strftime(_TS_FORMAT) if run.finished_at else "-"),
             run.status,
             str(run.exit_code) if run.exit_code is not None else "-",
             str(run.stdout_path) if run.stdout_path else "-",
@@ -190,6 +206,8 @@ def show_runs(
 def run_once(ctx: typer.Context, name: str = typer.Argument(..., help="Nazwa zadania")) -> None:
     """Uruchom zadanie jednorazowo."""
 
+    from .runner import run_task
+
     database: Database = ctx.obj["db"]
     task = database.get_task(name)
     if not task:
@@ -200,7 +218,6 @@ def run_once(ctx: typer.Context, name: str = typer.Argument(..., help="Nazwa zad
     run_task(database, task, ctx.obj["data_dir"])
 
 
-codex/add-update-script-for-main-branch
 @app.command("update")
 def update_application(
     repo_dir: Optional[Path] = typer.Option(
@@ -217,6 +234,8 @@ def update_application(
 ) -> None:
     """Zaktualizuj aplikacje do najnowszej wersji z wybranego brancha."""
 
+    from .updater import UpdateError, default_repository_root, update_repository
+
     target_dir = repo_dir.expanduser().resolve() if repo_dir else default_repository_root()
     console.print(
         f"[blue]Aktualizuje repozytorium {target_dir} z brancha '{branch}'...[/blue]"
@@ -231,7 +250,8 @@ def update_application(
     if output:
         console.print(f"[dim]{output}[/dim]")
     console.print("[green]Aktualizacja zakonczona sukcesem.[/green]")
-=======
+
+
 @app.command("gui")
 def open_gui(ctx: typer.Context) -> None:
     """Uruchom interfejs graficzny do zarzadzania zadaniami."""
@@ -240,7 +260,6 @@ def open_gui(ctx: typer.Context) -> None:
 
     database: Database = ctx.obj["db"]
     launch_gui(ctx.obj["data_dir"], database=database)
-main
 
 
 @app.command("start")
@@ -250,6 +269,8 @@ def start_scheduler(
 ) -> None:
     """Uruchom serwis harmonogramu."""
 
+    from .scheduler_service import run_scheduler_loop
+
     database: Database = ctx.obj["db"]
     data_dir: Path = ctx.obj["data_dir"]
     run_scheduler_loop(database, data_dir, refresh_interval=refresh)
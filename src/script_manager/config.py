@@ -26,10 +26,17 @@ def default_data_dir() -> Path:
     return Path.home() / f".{APP_NAME.lower()}"
 
 
+# Directories already created during this process; ensure_data_dir runs in
+# every CLI callback, so skip the repeated mkdir/stat syscalls.
+_ensured_dirs: set[Path] = set()
+
+
 def ensure_data_dir(path: Path) -> Path:
     """Create the data directory if it does not exist and return it."""
 
-    path.mkdir(parents=True, exist_ok=True)
+    if path not in _ensured_dirs:
+        path.mkdir(parents=True, exist_ok=True)
+        _ensured_dirs.add(path)
     return path
 
 
@@ -1,7 +1,11 @@
 """SQLite persistence for Script Manager."""
 from __future__ import annotations
 
+import queue
 import sqlite3
+import sys
+import threading
+import time
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
@@ -10,21 +14,129 @@ from typing import Iterator, Optional
 from .models import Task, TaskRun
 
 
+def _path_or_none(value: Optional[str]) -> Optional[Path]:
+    return Path(value) if value else None
+
+
+# Maximum queued run-record updates applied per writer transaction.
+_WRITER_BATCH = 64
+
+# Statement texts live here as constants so every execute() ships the same
+# string object and SQLite's per-connection statement cache skips the
+# tokenize/plan step on the hot paths.
+# Display-formatted timestamps come back from SQLite's C-level strftime,
+# saving a datetime round trip per row in the GUI refresh paths.
+_TASK_DISPLAY_COLS = "strftime('%Y-%m-%d %H:%M:%S', created_at) AS created_at_display"
+_RUN_DISPLAY_COLS = (
+    "strftime('%Y-%m-%d %H:%M:%S', started_at) AS started_at_display,"
+    " strftime('%Y-%m-%d %H:%M:%S', finished_at) AS finished_at_display"
+)
+
+_SQL_ADD_TASK = f"""
+    INSERT INTO tasks (name, script_path, cron, python_executable, working_directory, created_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    RETURNING *, {_TASK_DISPLAY_COLS}
+"""
+_SQL_GET_TASK_BY_ID = f"SELECT *, {_TASK_DISPLAY_COLS} FROM tasks WHERE id = ?"
+_SQL_GET_TASK_BY_NAME = f"SELECT *, {_TASK_DISPLAY_COLS} FROM tasks WHERE name = ?"
+_SQL_LIST_TASKS = f"SELECT *, {_TASK_DISPLAY_COLS} FROM tasks ORDER BY name"
+_SQL_REMOVE_TASK = "DELETE FROM tasks WHERE name = ?"
+_SQL_RUN_START = """
+    INSERT INTO runs (task_id, started_at, status, stdout_path, stderr_path, message)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+_SQL_RUN_END = """
+    UPDATE runs
+       SET finished_at = ?, status = ?, exit_code = ?, message = COALESCE(?, message)
+     WHERE id = ?
+"""
+_SQL_RECENT_RUNS_FOR_TASK = (
+    f"SELECT *, {_RUN_DISPLAY_COLS} FROM runs"
+    " WHERE task_id = ? ORDER BY started_at DESC LIMIT ?"
+)
+_SQL_RECENT_RUNS = (
+    f"SELECT runs.*, tasks.name AS task_name, {_RUN_DISPLAY_COLS} FROM runs"
+    " JOIN tasks ON tasks.id = runs.task_id"
+    " ORDER BY runs.started_at DESC LIMIT ?"
+)
+
+
+def _utc_now_iso() -> str:
+    """Current UTC time as an ISO-8601 string with second precision.
+
+    Formats directly from the C-level struct_time instead of building a
+    datetime only to serialise it again; also sidesteps the deprecated
+    ``datetime.utcnow``.
+    """
+
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime())
+
+
 class Database:
     """Wrapper around a SQLite database storing tasks and run history."""
 
     def __init__(self, path: Path) -> None:
         self.path = path
+        # Monotonic counter bumped whenever the task set may have changed,
+        # either by our own mutations or by another connection's commit
+        # (detected via PRAGMA data_version). list_tasks() results are
+        # cached per version; callers can poll tasks_version cheaply.
+        self._tasks_version = 0
+        self._tasks_cache: Optional[list[Task]] = None
+        self._tasks_cache_version: Optional[int] = None
+        # Set whenever this instance mutates the task set; in-process
+        # listeners (the scheduler) wait on it instead of pure polling.
+        self.change_event = threading.Event()
+        # One connection per thread: WAL lets readers run concurrently with
+        # a writer, so scheduler jobs and GUI refreshes no longer serialise
+        # behind a single shared connection.
+        self._local = threading.local()
+        # Guards the version/cache bookkeeping shared between threads.
+        self._cache_lock = threading.Lock()
+        # Run-end updates are queued and committed in batches by a single
+        # background writer, amortising one fsync across many finishing jobs.
+        self._write_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, cached_statements=256)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-8192")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+            # data_version values are only comparable within one
+            # connection; a fresh connection starts out "unknown" so its
+            # first staleness check always invalidates the cache.
+            self._local.data_version = None
+        return conn
 
     @contextmanager
     def connect(self) -> Iterator[sqlite3.Connection]:
-        conn = sqlite3.connect(self.path)
-        conn.row_factory = sqlite3.Row
+        conn = self._connection()
         try:
             yield conn
             conn.commit()
-        finally:
+        except Exception:
+            conn.rollback()
+            raise
+
+    def close(self) -> None:
+        """Close the calling thread's connection (a later call reopens it)."""
+
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            # Documented idiom: lets SQLite re-ANALYZE only the tables
+            # whose statistics have actually drifted.
+            conn.execute("PRAGMA optimize")
             conn.close()
+            self._local.conn = None
 
     def initialise(self) -> None:
         """Create tables if they do not exist."""
@@ -58,6 +170,30 @@ class Database:
                 )
                 """
             )
+            # tasks.name already has the implicit UNIQUE index; runs needs
+            # indexes for the recent_runs ORDER BY/LIMIT paths.
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_runs_task_started"
+                " ON runs(task_id, started_at DESC)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_runs_started ON runs(started_at DESC)"
+            )
+            # Seed planner statistics so the runs indexes are chosen for
+            # the ORDER BY ... LIMIT paths. ANALYZE on empty tables leaves
+            # sqlite_stat1 empty, so gate on the row count rather than the
+            # table's existence: re-seeding stays cheap while the database
+            # is empty and stops once real statistics exist. From then on
+            # PRAGMA optimize in close() (run on the CLI, GUI and
+            # scheduler shutdown paths) keeps them current.
+            has_stats = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            ).fetchone()
+            if (
+                has_stats is None
+                or conn.execute("SELECT count(*) FROM sqlite_stat1").fetchone()[0] == 0
+            ):
+                conn.execute("ANALYZE")
 
     def add_task(
         self,
@@ -68,47 +204,86 @@ class Database:
         python_executable: Optional[Path],
         working_directory: Optional[Path],
     ) -> Task:
-        """Insert a new task and return it."""
+        """Insert a new task and return it.
+
+        Raises:
+            ValueError: When a task with the same name already exists.
+        """
 
         with self.connect() as conn:
-            cursor = conn.execute(
-                """
-                INSERT INTO tasks (name, script_path, cron, python_executable, working_directory, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    name,
-                    str(script_path),
-                    cron,
-                    str(python_executable) if python_executable else None,
-                    str(working_directory) if working_directory else None,
-                    datetime.utcnow().isoformat(timespec="seconds"),
-                ),
-            )
-            task_id = cursor.lastrowid
-        return self.get_task_by_id(task_id)
+            try:
+                row = conn.execute(
+                    _SQL_ADD_TASK,
+                    (
+                        name,
+                        str(script_path),
+                        cron,
+                        str(python_executable) if python_executable else None,
+                        str(working_directory) if working_directory else None,
+                        _utc_now_iso(),
+                    ),
+                ).fetchone()
+            except sqlite3.IntegrityError as exc:
+                raise ValueError(f"Task with name '{name}' already exists") from exc
+        self._invalidate_tasks_cache()
+        return self._row_to_task(row)
 
     def get_task_by_id(self, task_id: int) -> Task:
         with self.connect() as conn:
-            row = conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            row = conn.execute(_SQL_GET_TASK_BY_ID, (task_id,)).fetchone()
         if not row:
             raise ValueError(f"Task with id {task_id} not found")
         return self._row_to_task(row)
 
     def get_task(self, name: str) -> Optional[Task]:
         with self.connect() as conn:
-            row = conn.execute("SELECT * FROM tasks WHERE name = ?", (name,)).fetchone()
+            row = conn.execute(_SQL_GET_TASK_BY_NAME, (name,)).fetchone()
         return self._row_to_task(row) if row else None
 
+    @property
+    def tasks_version(self) -> int:
+        """Counter that changes whenever the stored tasks may have changed.
+
+        Pollers (e.g. the scheduler) can compare this against the last value
+        they acted on and skip a full list_tasks() when it is unchanged.
+        """
+
+        with self._cache_lock, self.connect() as conn:
+            self._refresh_tasks_version(conn)
+            return self._tasks_version
+
+    def _refresh_tasks_version(self, conn: sqlite3.Connection) -> None:
+        # Compare against the value last seen on *this* connection: SQLite
+        # only defines data_version relative to earlier reads on the same
+        # connection, so a shared baseline would miss external commits.
+        data_version = self._data_version(conn)
+        if data_version != self._local.data_version:
+            self._local.data_version = data_version
+            self._tasks_version += 1
+            self._tasks_cache = None
+
     def list_tasks(self) -> list[Task]:
-        with self.connect() as conn:
-            rows = conn.execute("SELECT * FROM tasks ORDER BY name").fetchall()
-        return [self._row_to_task(row) for row in rows]
+        with self._cache_lock:
+            with self.connect() as conn:
+                self._refresh_tasks_version(conn)
+                if self._tasks_cache is not None and self._tasks_cache_version == self._tasks_version:
+                    return list(self._tasks_cache)
+
+                # Convert while iterating the cursor; no intermediate row list.
+                tasks = [
+                    self._row_to_task(row)
+                    for row in conn.execute(_SQL_LIST_TASKS)
+                ]
+            self._tasks_cache = tasks
+            self._tasks_cache_version = self._tasks_version
+            return list(tasks)
 
     def remove_task(self, name: str) -> bool:
         with self.connect() as conn:
-            cursor = conn.execute("DELETE FROM tasks WHERE name = ?", (name,))
+            cursor = conn.execute(_SQL_REMOVE_TASK, (name,))
             removed = cursor.rowcount > 0
+        if removed:
+            self._invalidate_tasks_cache()
         return removed
 
     def record_run_start(
@@ -122,10 +297,7 @@ class Database:
     ) -> int:
         with self.connect() as conn:
             cursor = conn.execute(
-                """
-                INSERT INTO runs (task_id, started_at, status, stdout_path, stderr_path, message)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
+                _SQL_RUN_START,
                 (
                     task_id,
                     started_at.isoformat(timespec="seconds"),
@@ -146,13 +318,16 @@ class Database:
         exit_code: Optional[int],
         message: Optional[str] = None,
     ) -> None:
-        with self.connect() as conn:
-            conn.execute(
-                """
-                UPDATE runs
-                   SET finished_at = ?, status = ?, exit_code = ?, message = COALESCE(?, message)
-                 WHERE id = ?
-                """,
+        """Queue the run-end update; the background writer commits it.
+
+        Callers that need the update to be visible immediately should call
+        :meth:`flush`; the read paths here do so themselves.
+        """
+
+        self._ensure_writer()
+        self._write_queue.put(
+            (
+                "end",
                 (
                     finished_at.isoformat(timespec="seconds"),
                     status,
@@ -161,23 +336,105 @@ class Database:
                     run_id,
                 ),
             )
+        )
+
+    def flush(self) -> None:
+        """Block until every queued run-record write has been committed."""
+
+        if self._writer_thread is None:
+            return
+        self._ensure_writer()
+        done = threading.Event()
+        self._write_queue.put(("flush", done))
+        done.wait()
+
+    def _ensure_writer(self) -> None:
+        thread = self._writer_thread
+        if thread is not None and thread.is_alive():
+            return
+        with self._writer_lock:
+            thread = self._writer_thread
+            if thread is None or not thread.is_alive():
+                thread = threading.Thread(
+                    target=self._writer_loop,
+                    name="script-manager-db-writer",
+                    daemon=True,
+                )
+                thread.start()
+                self._writer_thread = thread
+
+    def _writer_loop(self) -> None:
+        while True:
+            batch = [self._write_queue.get()]
+            # Drain whatever else is already queued so jobs finishing in the
+            # same tick share one transaction (and one fsync).
+            while len(batch) < _WRITER_BATCH:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            flush_events = []
+            params = []
+            for kind, payload in batch:
+                if kind == "flush":
+                    flush_events.append(payload)
+                else:
+                    params.append(payload)
+            try:
+                if params:
+                    try:
+                        with self.connect() as conn:
+                            conn.executemany(_SQL_RUN_END, params)
+                    except Exception:
+                        # One bad parameter set must not kill the writer
+                        # thread or drop the rest of the batch: retry row
+                        # by row and report only the individual failures.
+                        for row in params:
+                            try:
+                                with self.connect() as conn:
+                                    conn.execute(_SQL_RUN_END, row)
+                            except Exception as exc:  # noqa: BLE001
+                                print(
+                                    f"script_manager: run-end update for run"
+                                    f" {row[-1]} failed: {exc}",
+                                    file=sys.stderr,
+                                )
+            finally:
+                for event in flush_events:
+                    event.set()
 
     def recent_runs(self, *, limit: int = 10, task_name: Optional[str] = None) -> list[TaskRun]:
-        query = (
-            "SELECT runs.*, tasks.name as task_name FROM runs JOIN tasks ON tasks.id = runs.task_id"
-        )
-        params: tuple[object, ...]
+        # Read-your-writes: make sure queued run-end updates are committed.
+        self.flush()
         if task_name:
-            query += " WHERE tasks.name = ?"
-            params = (task_name,)
-        else:
-            params = tuple()
-        query += " ORDER BY runs.started_at DESC LIMIT ?"
-        params = params + (limit,)
+            # Resolve the task through the UNIQUE index on tasks.name and
+            # query runs by id directly, so the composite runs index serves
+            # the ORDER BY/LIMIT without a join.
+            task = self.get_task(task_name)
+            if task is None:
+                return []
+            with self.connect() as conn:
+                cursor = conn.execute(_SQL_RECENT_RUNS_FOR_TASK, (task.id, limit))
+                return [self._row_to_run(row, task_name=task_name) for row in cursor]
 
         with self.connect() as conn:
-            rows = conn.execute(query, params).fetchall()
-        return [self._row_to_run(row) for row in rows]
+            cursor = conn.execute(_SQL_RECENT_RUNS, (limit,))
+            # The join aliases task_name explicitly, so no per-row keys()
+            # probe (which builds a fresh list per call) is needed.
+            return [self._row_to_run(row, task_name=row["task_name"]) for row in cursor]
+
+    @staticmethod
+    def _data_version(conn: sqlite3.Connection) -> int:
+        # Bumped whenever *another* connection commits a change; our own
+        # writes invalidate the cache explicitly.
+        return conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _invalidate_tasks_cache(self) -> None:
+        with self._cache_lock:
+            self._tasks_version += 1
+            self._tasks_cache = None
+        self.change_event.set()
 
     @staticmethod
     def _row_to_task(row: sqlite3.Row) -> Task:
@@ -186,14 +443,14 @@ class Database:
             name=row["name"],
             script_path=Path(row["script_path"]),
             cron=row["cron"],
-            python_executable=Path(row["python_executable"]) if row["python_executable"] else None,
-            working_directory=Path(row["working_directory"]) if row["working_directory"] else None,
+            python_executable=_path_or_none(row["python_executable"]),
+            working_directory=_path_or_none(row["working_directory"]),
             created_at=datetime.fromisoformat(row["created_at"]),
+            created_at_display=row["created_at_display"],
         )
 
     @staticmethod
-    def _row_to_run(row: sqlite3.Row) -> TaskRun:
-        task_name = row["task_name"] if "task_name" in row.keys() else None
+    def _row_to_run(row: sqlite3.Row, task_name: Optional[str] = None) -> TaskRun:
         return TaskRun(
             id=row["id"],
             task_id=row["task_id"],
@@ -202,9 +459,11 @@ class Database:
             finished_at=datetime.fromisoformat(row["finished_at"]) if row["finished_at"] else None,
             status=row["status"],
             exit_code=row["exit_code"],
-            stdout_path=Path(row["stdout_path"]) if row["stdout_path"] else None,
-            stderr_path=Path(row["stderr_path"]) if row["stderr_path"] else None,
+            stdout_path=_path_or_none(row["stdout_path"]),
+            stderr_path=_path_or_none(row["stderr_path"]),
             message=row["message"],
+            started_at_display=row["started_at_display"],
+            finished_at_display=row["finished_at_display"],
         )
 
 
@@ -1,16 +1,49 @@
 """Simple Tkinter-based GUI for managing scheduled scripts."""
 from __future__ import annotations
 
+import bisect
+import os
+import queue
+import stat
 import sys
+import threading
 import tkinter as tk
+import traceback
+from functools import lru_cache
 from pathlib import Path
 from tkinter import filedialog, messagebox, ttk
-from typing import Optional
-
-from apscheduler.triggers.cron import CronTrigger
+from typing import Any, Callable, Optional
 
 from .config import APP_NAME, default_data_dir, ensure_data_dir
 from .db import Database
+from .models import Task
+from .scheduler_service import cron_trigger
+
+# Shared display format for timestamps; kept as a constant so per-row
+# strftime calls reuse the same parsed format string.
+_TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@lru_cache(maxsize=256)
+def _path_kind(path: Path) -> str:
+    """Classify ``path`` as ``file``/``dir``/``other``/``missing``.
+
+    A single ``os.stat`` answers both existence and type, instead of the
+    separate ``exists``/``is_file``/``is_dir`` probes that each hit the
+    filesystem. Results are cached only to dedupe stats within a single
+    validation pass; each pass starts by clearing the cache, so a file
+    created after a failed submit is seen on the very next attempt.
+    """
+
+    try:
+        mode = os.stat(path).st_mode
+    except OSError:
+        return "missing"
+    if stat.S_ISREG(mode):
+        return "file"
+    if stat.S_ISDIR(mode):
+        return "dir"
+    return "other"
 
 
 class ScriptManagerGUI:
@@ -22,8 +55,51 @@ class ScriptManagerGUI:
         self.root.title(f"{APP_NAME} - GUI")
         self.root.geometry("1000x600")
 
+        # Tasks currently shown in the tree, keyed by row iid (task name),
+        # so row actions never have to re-query or parse display strings.
+        self._displayed_tasks: dict[str, Task] = {}
+
+        # Completed background work; drained on the Tk thread so database
+        # I/O never blocks the event loop and dialogs stay on the main thread.
+        self._results: queue.Queue = queue.Queue()
+
+        # One long-lived worker runs all database jobs, so the per-thread
+        # SQLite connection (and its WAL/pragma setup) is paid for once
+        # and reused instead of being rebuilt by a throwaway thread per
+        # operation. Jobs also serialise naturally in submission order.
+        self._jobs: queue.SimpleQueue = queue.SimpleQueue()
+        self._db_worker = threading.Thread(
+            target=self._db_worker_loop,
+            name="gui-db-worker",
+            daemon=True,
+        )
+        self._db_worker.start()
+
+        # True while a coalesced refresh is waiting in the idle queue.
+        self._refresh_pending = False
+
+        # Last values tuple written per row iid; refreshes diff against
+        # these so unchanged rows cost no Tk calls at all.
+        self._tasks_snapshot: dict[str, tuple] = {}
+        self._runs_snapshot: dict[str, tuple] = {}
+
+        # Refresh generations; results from superseded queries are dropped.
+        self._tasks_generation = 0
+        self._runs_generation = 0
+
+        # Debounce state for selection-driven history refreshes.
+        self._pending_runs_after: Optional[str] = None
+        self._last_selection: Optional[str] = None
+
+        # The add-task dialog is built once and then hidden/re-shown;
+        # rebuilding the Toplevel on every click makes Tk redo widget
+        # creation and font-metric work for an identical form.
+        self._add_dialog: Optional[tk.Toplevel] = None
+        self._add_entries: dict[str, tk.Entry] = {}
+
         self._build_widgets()
         self.refresh_tasks()
+        self.root.after(50, self._drain_results)
 
     # ------------------------------------------------------------------
     # UI construction helpers
@@ -54,7 +130,8 @@ class ScriptManagerGUI:
             self.tasks_tree.column(col, width=180, anchor=tk.W)
 
         self.tasks_tree.pack(fill=tk.BOTH, expand=True)
-        self.tasks_tree.bind("<<TreeviewSelect>>", lambda event: self.refresh_runs())
+        self.tasks_tree.bind("<<TreeviewSelect>>", self._on_tasks_select)
+        self.tasks_tree.bind("<Double-1>", self._show_task_details)
 
         buttons_frame = ttk.Frame(top_frame)
         buttons_frame.pack(fill=tk.X, pady=(10, 0))
@@ -93,34 +170,166 @@ class ScriptManagerGUI:
 
         self.runs_tree.pack(fill=tk.BOTH, expand=True)
 
+    # ------------------------------------------------------------------
+    # Background work helpers
+    def _run_async(
+        self,
+        work: Callable[[], Any],
+        on_success: Callable[[Any], None],
+        on_error: Callable[[Exception], None],
+    ) -> None:
+        """Queue ``work`` for the DB worker; the outcome is delivered on the Tk thread."""
+
+        self._jobs.put((work, on_success, on_error))
+
+    def _db_worker_loop(self) -> None:
+        while True:
+            work, on_success, on_error = self._jobs.get()
+            try:
+                result = work()
+            except Exception as exc:  # noqa: BLE001 - reported via on_error
+                self._results.put((on_error, exc))
+            else:
+                self._results.put((on_success, result))
+
+    def _drain_results(self) -> None:
+        try:
+            while True:
+                callback, payload = self._results.get_nowait()
+                try:
+                    callback(payload)
+                except Exception:  # noqa: BLE001
+                    # This loop is the only delivery channel for async DB
+                    # results; one failing callback must not stop it (or
+                    # every later refresh would silently freeze the UI).
+                    traceback.print_exc()
+        except queue.Empty:
+            pass
+        finally:
+            self.root.after(50, self._drain_results)
+
     # ------------------------------------------------------------------
     # Task management
     def refresh_tasks(self) -> None:
-        for item in self.tasks_tree.get_children():
-            self.tasks_tree.delete(item)
-
-        for task in self.database.list_tasks():
-            python_exec = task.python_executable or Path(sys.executable)
-            working_dir = task.working_directory or Path("-")
-            created_at = task.created_at.strftime("%Y-%m-%d %H:%M:%S")
-            self.tasks_tree.insert(
-                "",
-                tk.END,
-                iid=task.name,
-                values=(
-                    str(task.script_path),
-                    task.cron,
-                    str(python_exec),
-                    str(working_dir),
-                    created_at,
-                ),
-            )
+        """Request a full rebuild; back-to-back requests coalesce into one.
+
+        The actual rebuild runs from the idle queue, so a burst of refresh
+        triggers (button mashing, programmatic reloads) costs one redraw.
+        """
+
+        if self._refresh_pending:
+            return
+        self._refresh_pending = True
+        self.root.after_idle(self._flush_refresh)
+
+    def _flush_refresh(self) -> None:
+        self._refresh_pending = False
+        # Query on a worker thread; only the Treeview diff runs on the Tk
+        # thread, so the event loop never blocks on database I/O.
+        self._tasks_generation += 1
+        generation = self._tasks_generation
+        self._run_async(
+            self.database.list_tasks,
+            on_success=lambda tasks: self._apply_tasks(generation, tasks),
+            on_error=lambda exc: messagebox.showerror(
+                "Blad", f"Nie udalo sie odswiezyc zadan: {exc}", parent=self.root
+            ),
+        )
+
+    def _apply_tasks(self, generation: int, tasks: list[Task]) -> None:
+        if generation != self._tasks_generation:
+            return  # A newer refresh is already in flight; drop stale data.
+        self._displayed_tasks = {task.name: task for task in tasks}
+        row_values = self._task_row_values
+        new_rows = {task.name: row_values(task) for task in tasks}
+        self._apply_tree_diff(self.tasks_tree, self._tasks_snapshot, new_rows)
+        self._tasks_snapshot = new_rows
+        # If a forced redraw is ever needed here, use update_idletasks();
+        # never update(), which re-enters arbitrary callbacks and can cause
+        # recursive redraw storms.
 
         self.refresh_runs()
 
+    @staticmethod
+    def _apply_tree_diff(
+        tree: ttk.Treeview,
+        old_rows: dict[str, tuple],
+        new_rows: dict[str, tuple],
+    ) -> None:
+        """Apply only the row deltas between two refreshes.
+
+        ``new_rows`` must list surviving rows in the same relative order as
+        the previous refresh (both trees render stable query orderings), so
+        positional inserts keep the display order intact.
+        """
+
+        stale = [iid for iid in old_rows if iid not in new_rows]
+        if stale:
+            tree.delete(*stale)
+        # Bind the hot lookups once; saves an attribute resolution per row.
+        insert = tree.insert
+        item = tree.item
+        for position, (iid, values) in enumerate(new_rows.items()):
+            old = old_rows.get(iid)
+            if old is None:
+                insert("", position, iid=iid, values=values)
+            elif old != values:
+                item(iid, values=values)
+
+    @staticmethod
+    def _task_row_values(task: Task) -> tuple[str, str, str, str, str]:
+        # Render only basenames: long paths are mostly noise in the columns
+        # and every character crosses the Python/Tcl boundary on insert.
+        # Full paths are shown in the double-click details dialog.
+        python_exec = task.python_executable or Path(sys.executable)
+        created_at = task.created_at_display or task.created_at.strftime(_TS_FORMAT)
+        return (
+            task.script_path.name,
+            task.cron,
+            python_exec.name,
+            task.working_directory.name if task.working_directory else "-",
+            created_at,
+        )
+
+    def _show_task_details(self, _event: object) -> None:
+        selection = self.tasks_tree.selection()
+        if not selection:
+            return
+        task = self._displayed_tasks.get(selection[0])
+        if task is None:
+            return
+        python_exec = task.python_executable or Path(sys.executable)
+        details = "\n".join(
+            (
+                f"Skrypt: {task.script_path}",
+                f"Cron: {task.cron}",
+                f"Interpreter: {python_exec}",
+                f"Katalog roboczy: {task.working_directory or '-'}",
+                f"Utworzono: {task.created_at_display or task.created_at.strftime(_TS_FORMAT)}",
+            )
+        )
+        messagebox.showinfo(task.name, details, parent=self.root)
+
+    def _insert_task_row(self, task: Task) -> None:
+        """Insert a single new row, keeping the name ordering from list_tasks."""
+
+        index = bisect.bisect_left(self.tasks_tree.get_children(), task.name)
+        values = self._task_row_values(task)
+        self.tasks_tree.insert("", index, iid=task.name, values=values)
+        self._displayed_tasks[task.name] = task
+        self._tasks_snapshot[task.name] = values
+
     def open_add_dialog(self) -> None:
+        if self._add_dialog is not None:
+            for entry in self._add_entries.values():
+                entry.delete(0, tk.END)
+            self._add_dialog.deiconify()
+            self._add_dialog.grab_set()
+            return
+
         dialog = tk.Toplevel(self.root)
         dialog.title("Dodaj zadanie")
+        dialog.protocol("WM_DELETE_WINDOW", self._close_add_dialog)
         dialog.grab_set()
 
         form_fields = (
@@ -171,9 +380,18 @@ class ScriptManagerGUI:
         )
         submit_btn.pack(side=tk.LEFT, padx=5)
 
-        cancel_btn = ttk.Button(buttons_frame, text="Anuluj", command=dialog.destroy)
+        cancel_btn = ttk.Button(buttons_frame, text="Anuluj", command=self._close_add_dialog)
         cancel_btn.pack(side=tk.LEFT)
 
+        self._add_dialog = dialog
+        self._add_entries = entries
+
+    def _close_add_dialog(self) -> None:
+        if self._add_dialog is None:
+            return
+        self._add_dialog.grab_release()
+        self._add_dialog.withdraw()
+
     def _choose_file(self, entry: tk.Entry) -> None:
         file_path = filedialog.askopenfilename(parent=self.root)
         if file_path:
@@ -187,6 +405,10 @@ class ScriptManagerGUI:
             entry.insert(0, directory)
 
     def _create_task(self, dialog: tk.Toplevel, entries: dict[str, tk.Entry]) -> None:
+        # Fresh stat results for every submit; the cache only dedupes
+        # lookups within this validation pass.
+        _path_kind.cache_clear()
+
         name = entries["name"].get().strip()
         script = entries["script"].get().strip()
         cron = entries["cron"].get().strip()
@@ -198,40 +420,45 @@ class ScriptManagerGUI:
             return
 
         script_path = Path(script).expanduser()
-        if not script_path.exists():
+        if _path_kind(script_path) != "file":
             messagebox.showerror("Blad", "Wybrany skrypt nie istnieje.", parent=dialog)
             return
 
         try:
-            CronTrigger.from_crontab(cron)
+            cron_trigger(cron)
         except ValueError as exc:
             messagebox.showerror("Blad", f"Niepoprawne wyrazenie cron: {exc}", parent=dialog)
             return
 
         python_path = Path(python_exec).expanduser() if python_exec else None
-        if python_path and not python_path.exists():
+        if python_path and _path_kind(python_path) == "missing":
             messagebox.showerror("Blad", "Podany interpreter nie istnieje.", parent=dialog)
             return
 
         working_path = Path(working_dir).expanduser() if working_dir else None
-        if working_path and not working_path.exists():
+        if working_path and _path_kind(working_path) != "dir":
             messagebox.showerror("Blad", "Katalog roboczy nie istnieje.", parent=dialog)
             return
 
-        try:
-            self.database.add_task(
+        self._run_async(
+            lambda: self.database.add_task(
                 name=name,
                 script_path=script_path,
                 cron=cron,
                 python_executable=python_path,
                 working_directory=working_path,
-            )
-        except Exception as exc:  # pragma: no cover - GUI feedback
-            messagebox.showerror("Blad", f"Nie udalo sie dodac zadania: {exc}", parent=dialog)
-            return
+            ),
+            on_success=self._on_task_added,
+            on_error=lambda exc: messagebox.showerror(
+                "Blad", f"Nie udalo sie dodac zadania: {exc}", parent=dialog
+            ),
+        )
 
-        dialog.destroy()
-        self.refresh_tasks()
+    def _on_task_added(self, task: Task) -> None:
+        self._close_add_dialog()
+        # Only the new row changed; a full rebuild is reserved for the
+        # explicit refresh button and the initial load.
+        self._insert_task_row(task)
 
     def remove_selected_task(self) -> None:
         selection = self.tasks_tree.selection()
@@ -241,40 +468,85 @@ class ScriptManagerGUI:
 
         task_name = selection[0]
         if messagebox.askyesno("Potwierdzenie", f"Czy na pewno usunac zadanie '{task_name}'?", parent=self.root):
-            removed = self.database.remove_task(task_name)
-            if not removed:
-                messagebox.showerror("Blad", "Nie znaleziono zadania do usuniecia.", parent=self.root)
+            self._run_async(
+                lambda: self.database.remove_task(task_name),
+                on_success=lambda removed: self._on_task_removed(task_name, removed),
+                on_error=lambda exc: messagebox.showerror(
+                    "Blad", f"Nie udalo sie usunac zadania: {exc}", parent=self.root
+                ),
+            )
+
+    def _on_task_removed(self, task_name: str, removed: bool) -> None:
+        if not removed:
+            messagebox.showerror("Blad", "Nie znaleziono zadania do usuniecia.", parent=self.root)
             self.refresh_tasks()
+            return
+        self.tasks_tree.delete(task_name)
+        self._displayed_tasks.pop(task_name, None)
+        self._tasks_snapshot.pop(task_name, None)
+        self.refresh_runs()
 
     # ------------------------------------------------------------------
     # Runs history
-    def refresh_runs(self) -> None:
-        for item in self.runs_tree.get_children():
-            self.runs_tree.delete(item)
+    def _on_tasks_select(self, _event: object) -> None:
+        """Debounce selection changes: arrowing through rows fires one query.
+
+        Events that do not actually change the selection short-circuit
+        before scheduling anything.
+        """
+
+        selection = self.tasks_tree.selection()
+        task_name = selection[0] if selection else None
+        if task_name == self._last_selection:
+            return
+        self._last_selection = task_name
+        if self._pending_runs_after is not None:
+            self.root.after_cancel(self._pending_runs_after)
+        self._pending_runs_after = self.root.after(120, self._flush_refresh_runs)
 
+    def _flush_refresh_runs(self) -> None:
+        self._pending_runs_after = None
+        self.refresh_runs()
+
+    def refresh_runs(self) -> None:
         selection = self.tasks_tree.selection()
         task_name = selection[0] if selection else None
 
-        runs = self.database.recent_runs(limit=20, task_name=task_name)
+        self._runs_generation += 1
+        generation = self._runs_generation
+        self._run_async(
+            lambda: self.database.recent_runs(limit=20, task_name=task_name),
+            on_success=lambda runs: self._apply_runs(generation, runs),
+            on_error=lambda exc: messagebox.showerror(
+                "Blad", f"Nie udalo sie odswiezyc historii: {exc}", parent=self.root
+            ),
+        )
+
+    def _apply_runs(self, generation: int, runs: list) -> None:
+        if generation != self._runs_generation:
+            return
+        new_rows: dict[str, tuple] = {}
         for run in runs:
-            finished = run.finished_at.strftime("%Y-%m-%d %H:%M:%S") if run.finished_at else "-"
+            if run.finished_at_display:
+                finished = run.finished_at_display
+            else:
+                finished = run.finished_at.strftime(_TS_FORMAT) if run.finished_at else "-"
             exit_code = str(run.exit_code) if run.exit_code is not None else "-"
             message = run.message or ""
-            started = run.started_at.strftime("%Y-%m-%d %H:%M:%S")
+            started = run.started_at_display or run.started_at.strftime(_TS_FORMAT)
             task_label = run.task_name or str(run.task_id)
-            self.runs_tree.insert(
-                "",
-                tk.END,
-                values=(
-                    task_label,
-                    started,
-                    finished,
-                    run.status,
-                    exit_code,
-                    message,
-                ),
+            new_rows[str(run.id)] = (
+                task_label,
+                started,
+                finished,
+                run.status,
+                exit_code,
+                message,
             )
 
+        self._apply_tree_diff(self.runs_tree, self._runs_snapshot, new_rows)
+        self._runs_snapshot = new_rows
+
 
 def _resolve_data_dir(custom: Optional[Path]) -> Path:
     if custom:
@@ -297,7 +569,11 @@ def launch_gui(
 
     root = tk.Tk()
     ScriptManagerGUI(root, db)
-    root.mainloop()
+    try:
+        root.mainloop()
+    finally:
+        # Close the main thread's connection so PRAGMA optimize runs.
+        db.close()
 
 
 __all__ = ["launch_gui", "ScriptManagerGUI"]
@@ -1,7 +1,7 @@
 """Dataclasses describing tasks and run history."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -18,6 +18,23 @@ class Task:
     python_executable: Optional[Path]
     working_directory: Optional[Path]
     created_at: datetime
+    # Pre-formatted "%Y-%m-%d %H:%M:%S" string, filled in when the row
+    # comes from the database so display code can skip strftime.
+    created_at_display: Optional[str] = None
+    # str() forms of the path fields, computed once here so every
+    # scheduled run reuses them instead of re-converting the Paths.
+    script_path_str: str = field(init=False, repr=False)
+    python_executable_str: Optional[str] = field(init=False, repr=False)
+    working_directory_str: Optional[str] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.script_path_str = str(self.script_path)
+        self.python_executable_str = (
+            str(self.python_executable) if self.python_executable else None
+        )
+        self.working_directory_str = (
+            str(self.working_directory) if self.working_directory else None
+        )
 
 
 @dataclass(slots=True)
@@ -34,6 +51,9 @@ class TaskRun:
     stdout_path: Optional[Path]
     stderr_path: Optional[Path]
     message: Optional[str]
+    # Pre-formatted counterparts of started_at/finished_at (see Task).
+    started_at_display: Optional[str] = None
+    finished_at_display: Optional[str] = None
 
 
 __all__ = ["Task", "TaskRun"]
@@ -1,6 +1,7 @@
 """Task execution utilities."""
 from __future__ import annotations
 
+import os
 import subprocess
 import sys
 from datetime import datetime
@@ -15,37 +16,85 @@ class TaskExecutionError(RuntimeError):
     """Raised when a task fails before it can start."""
 
 
+# Log directories already created during this process; scheduled tasks run
+# repeatedly, so skip the mkdir/stat syscalls after the first run.
+_ensured_log_dirs: set[Path] = set()
+
+# Newest log files kept per task (each run produces two: stdout + stderr).
+MAX_LOGS_PER_TASK = 100
+
+# Interpreter used when a task does not name its own.
+_DEFAULT_PYTHON = sys.executable
+
+
+def _prune_old_logs(logs_dir: Path) -> None:
+    """Delete all but the newest ``MAX_LOGS_PER_TASK`` files in ``logs_dir``.
+
+    Uses ``os.scandir`` so the directory is read in batches and each
+    entry's mtime comes from the cached ``DirEntry`` stat rather than a
+    separate ``stat`` call per path.
+    """
+
+    with os.scandir(logs_dir) as it:
+        entries = [entry for entry in it if entry.is_file()]
+    if len(entries) <= MAX_LOGS_PER_TASK:
+        return
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in entries[MAX_LOGS_PER_TASK:]:
+        try:
+            os.unlink(entry.path)
+        except OSError:
+            # Another process may have rotated the file already.
+            pass
+
+
 def run_task(database: Database, task: Task, data_dir: Path) -> None:
     """Execute a task and record the result in the database."""
 
     logs_dir = data_dir / "logs" / task.name
-    logs_dir.mkdir(parents=True, exist_ok=True)
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    if logs_dir not in _ensured_log_dirs:
+        logs_dir.mkdir(parents=True, exist_ok=True)
+        _ensured_log_dirs.add(logs_dir)
+
+    started_at = datetime.utcnow()
+    timestamp = started_at.strftime("%Y%m%d_%H%M%S")
     stdout_path = logs_dir / f"{timestamp}.stdout.log"
     stderr_path = logs_dir / f"{timestamp}.stderr.log"
 
     run_id = database.record_run_start(
         task_id=task.id,
-        started_at=datetime.utcnow(),
+        started_at=started_at,
         stdout_path=stdout_path,
         stderr_path=stderr_path,
     )
 
-    executable = str(task.python_executable) if task.python_executable else sys.executable
-    script_path = str(task.script_path)
-    cwd: Optional[str] = str(task.working_directory) if task.working_directory else None
+    # The Task dataclass precomputes these str() forms at construction.
+    executable = task.python_executable_str or _DEFAULT_PYTHON
+    script_path = task.script_path_str
+    cwd: Optional[str] = task.working_directory_str
 
     try:
-        with stdout_path.open("w", encoding="utf-8") as stdout_file, stderr_path.open(
-            "w", encoding="utf-8"
-        ) as stderr_file:
-            process = subprocess.Popen(
-                [executable, script_path],
-                stdout=stdout_file,
-                stderr=stderr_file,
-                cwd=cwd,
-            )
-            exit_code = process.wait()
+        # Raw FDs: only the child ever writes to these files, so even the
+        # buffered binary file objects from open("wb") would just be unused
+        # parent-side allocations around the descriptor subprocess inherits.
+        # Avoiding preexec_fn/pass_fds/env also lets CPython spawn the child
+        # via posix_spawn instead of a full fork of the scheduler process.
+        stdout_fd = os.open(stdout_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            stderr_fd = os.open(stderr_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                completed = subprocess.run(
+                    [executable, script_path],
+                    stdout=stdout_fd,
+                    stderr=stderr_fd,
+                    cwd=cwd,
+                    check=False,
+                )
+            finally:
+                os.close(stderr_fd)
+        finally:
+            os.close(stdout_fd)
+        exit_code = completed.returncode
     except Exception as exc:  # noqa: BLE001 - we want to capture all exceptions
         database.record_run_end(
             run_id,
@@ -54,6 +103,7 @@ def run_task(database: Database, task: Task, data_dir: Path) -> None:
             exit_code=None,
             message=str(exc),
         )
+        database.flush()
         raise TaskExecutionError(str(exc)) from exc
 
     status = "success" if exit_code == 0 else "failed"
@@ -64,6 +114,13 @@ def run_task(database: Database, task: Task, data_dir: Path) -> None:
         exit_code=exit_code,
         message=None,
     )
+    # The writer thread is a daemon; make sure this run's record is on
+    # disk before short-lived callers (run-once) exit the process.
+    database.flush()
+
+    # Keep logs_dir bounded so history enumeration stays O(K) rather than
+    # growing with every run ever made.
+    _prune_old_logs(logs_dir)
 
 
 __all__ = ["run_task", "TaskExecutionError"]
@@ -1,8 +1,10 @@
 """Scheduler loop for running tasks based on cron expressions."""
 from __future__ import annotations
 
+import hashlib
 import signal
 import threading
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict
 
@@ -17,6 +19,19 @@ from .runner import run_task
 console = Console()
 
 
+@lru_cache(maxsize=128)
+def cron_trigger(expression: str) -> CronTrigger:
+    """Return a ``CronTrigger`` for ``expression``, reusing parsed instances.
+
+    Parsing a crontab string walks every field through APScheduler's
+    expression machinery; most installations use a handful of distinct
+    expressions, so caching the resulting triggers makes repeated
+    validation and rescheduling essentially free.
+    """
+
+    return CronTrigger.from_crontab(expression)
+
+
 class SchedulerService:
     """Manages APScheduler jobs and synchronises them with the database."""
 
@@ -27,6 +42,8 @@ class SchedulerService:
         self.scheduler = BackgroundScheduler()
         self._stop_event = threading.Event()
         self._scheduled_cron: Dict[str, str] = {}
+        self._last_tasks_version: int | None = None
+        self._last_fingerprint: bytes | None = None
 
     def start(self) -> None:
         console.print("[bold green]Starting Script Manager scheduler...[/bold green]")
@@ -35,14 +52,27 @@ class SchedulerService:
         self._install_signal_handlers()
         try:
             while not self._stop_event.is_set():
+                # Clear before synchronising so a mutation racing with the
+                # sync wakes the next wait immediately.
+                self.database.change_event.clear()
                 self._synchronise_jobs()
-                self._stop_event.wait(self.refresh_interval)
+                # Mutations through this Database instance wake us at once;
+                # refresh_interval remains the safety net for changes made
+                # by other processes.
+                self.database.change_event.wait(self.refresh_interval)
         finally:
             self.scheduler.shutdown(wait=True)
+            # Make sure batched run-record writes reach the database before
+            # the process exits, then close this thread's connection so
+            # PRAGMA optimize can refresh planner statistics.
+            self.database.flush()
+            self.database.close()
             console.print("[bold yellow]Scheduler stopped.[/bold yellow]")
 
     def stop(self) -> None:
         self._stop_event.set()
+        # Wake the main loop if it is blocked waiting for task changes.
+        self.database.change_event.set()
 
     def _install_signal_handlers(self) -> None:
         try:
@@ -57,8 +87,28 @@ class SchedulerService:
         self.stop()
 
     def _synchronise_jobs(self) -> None:
+        version = self.database.tasks_version
+        if version == self._last_tasks_version:
+            return
+        self._last_tasks_version = version
+
         tasks = {task.name: task for task in self.database.list_tasks()}
 
+        # Second-level guard: the version counter says "the database
+        # changed", the fingerprint says "schedule-relevant fields
+        # changed". Edits that do not touch name or cron (e.g. a new
+        # working directory) skip the add/remove/reschedule walk.
+        fingerprint = hashlib.blake2b(
+            b"\n".join(
+                f"{task.name}\x1f{task.cron}".encode()
+                for task in sorted(tasks.values(), key=lambda task: task.name)
+            ),
+            digest_size=16,
+        ).digest()
+        if fingerprint == self._last_fingerprint:
+            return
+        self._last_fingerprint = fingerprint
+
         # Remove jobs for deleted tasks
         for name in list(self._scheduled_cron.keys()):
             if name not in tasks:
@@ -76,7 +126,7 @@ class SchedulerService:
                 console.print(
                     f"[cyan]Updating schedule for task '{name}' to '{cron_expression}'.[/cyan]"
                 )
-                trigger = CronTrigger.from_crontab(cron_expression)
+                trigger = cron_trigger(cron_expression)
                 self.scheduler.reschedule_job(name, trigger=trigger)
                 self._scheduled_cron[name] = cron_expression
 
@@ -84,7 +134,7 @@ class SchedulerService:
         console.print(
             f"[green]Scheduling task '{task.name}' with cron '{task.cron}'.[/green]"
         )
-        trigger = CronTrigger.from_crontab(task.cron)
+        trigger = cron_trigger(task.cron)
         self.scheduler.add_job(
             self._run_task_job,
             trigger=trigger,
@@ -113,4 +163,4 @@ def run_scheduler_loop(database: Database, data_dir: Path, refresh_interval: int
     service.start()
 
 
-__all__ = ["SchedulerService", "run_scheduler_loop"]
+__all__ = ["SchedulerService", "cron_trigger", "run_scheduler_loop"]
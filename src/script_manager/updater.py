@@ -1,8 +1,10 @@
 """Utilities for updating the local installation from the Git repository."""
 from __future__ import annotations
 
+import os
 import shutil
 import subprocess
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterable, List
 
@@ -26,10 +28,29 @@ def _ensure_git_available() -> None:
         raise UpdateError("Polecenie 'git' nie jest dostepne w systemie.")
 
 
+@lru_cache(maxsize=1)
+def _git_env() -> dict[str, str]:
+    """Environment for git subprocesses, built once per process.
+
+    ``GIT_OPTIONAL_LOCKS=0`` keeps read-only commands (``status``) from
+    taking the index lock, ``GIT_TERMINAL_PROMPT=0`` makes git fail fast
+    instead of blocking on credential prompts, and ``LC_ALL=C`` skips
+    locale/gettext initialisation in every spawned process.
+    """
+
+    return {
+        **os.environ,
+        "GIT_OPTIONAL_LOCKS": "0",
+        "GIT_TERMINAL_PROMPT": "0",
+        "LC_ALL": "C",
+    }
+
+
 def _run_git_command(args: Iterable[str], cwd: Path) -> str:
     result = subprocess.run(
         list(args),
         cwd=str(cwd),
+        env=_git_env(),
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         text=True,
@@ -76,16 +97,27 @@ def update_repository(repo_dir: Path, branch: str = "main", force: bool = False)
         )
     output.append(status_output)
 
+    try:
+        current_branch = _run_git_command(
+            ["git", "symbolic-ref", "--short", "HEAD"], repo_dir
+        ).strip()
+    except UpdateError:
+        # Detached HEAD; the checkout below puts us on the right branch.
+        current_branch = None
+
     output.append(_run_git_command(["git", "fetch", "origin", branch], repo_dir))
-    output.append(_run_git_command(["git", "checkout", branch], repo_dir))
+    if current_branch != branch:
+        output.append(_run_git_command(["git", "checkout", branch], repo_dir))
 
+    # Integrate FETCH_HEAD directly instead of going through pull/origin
+    # refs; this avoids a second repository open inside `git pull`.
     if force:
         output.append(
-            _run_git_command(["git", "reset", "--hard", f"origin/{branch}"], repo_dir)
+            _run_git_command(["git", "reset", "--hard", "FETCH_HEAD"], repo_dir)
         )
     else:
         output.append(
-            _run_git_command(["git", "pull", "--ff-only", "origin", branch], repo_dir)
+            _run_git_command(["git", "merge", "--ff-only", "FETCH_HEAD"], repo_dir)
         )
 
     return "\n".join(filter(None, (part.strip() for part in output)))
@@ -29,6 +29,69 @@ def test_add_and_get_task(tmp_path: Path) -> None:
     assert fetched.cron == "0 0 * * *"
 
 
+def test_list_tasks_cache_invalidated_on_mutation(tmp_path: Path) -> None:
+    db = create_db(tmp_path)
+    assert db.list_tasks() == []
+
+    db.add_task(
+        name="demo",
+        script_path=Path("/tmp/demo.py"),
+        cron="0 0 * * *",
+        python_executable=None,
+        working_directory=None,
+    )
+    assert [task.name for task in db.list_tasks()] == ["demo"]
+
+    db.remove_task("demo")
+    assert db.list_tasks() == []
+
+
+def test_list_tasks_sees_external_commits(tmp_path: Path) -> None:
+    db = create_db(tmp_path)
+    assert db.list_tasks() == []
+
+    # A separate Database instance stands in for another process writing
+    # to the same file; its commits must invalidate our cached task list.
+    other = Database(tmp_path / "test.db")
+    other.add_task(
+        name="demo",
+        script_path=Path("/tmp/demo.py"),
+        cron="0 0 * * *",
+        python_executable=None,
+        working_directory=None,
+    )
+
+    assert [task.name for task in db.list_tasks()] == ["demo"]
+
+
+def test_recent_runs_orders_bulk_history(tmp_path: Path) -> None:
+    db = create_db(tmp_path)
+    task = db.add_task(
+        name="demo",
+        script_path=Path("/tmp/demo.py"),
+        cron="0 0 * * *",
+        python_executable=None,
+        working_directory=None,
+    )
+
+    rows = [
+        (task.id, f"2024-01-01T00:{minute:02d}:00", "success", 0)
+        for minute in range(50)
+    ]
+    with db.connect() as conn:
+        conn.executemany(
+            "INSERT INTO runs (task_id, started_at, status, exit_code) VALUES (?, ?, ?, ?)",
+            rows,
+        )
+
+    runs = db.recent_runs(limit=10)
+    assert len(runs) == 10
+    assert all(run.task_name == "demo" for run in runs)
+    started = [run.started_at for run in runs]
+    assert started == sorted(started, reverse=True)
+    assert started[0].minute == 49
+
+
 def test_record_run_history(tmp_path: Path) -> None:
     db = create_db(tmp_path)
     task = db.add_task(
@@ -22,17 +22,50 @@ def test_update_repository_runs_expected_commands(tmp_path, monkeypatch):
         executed.append((tuple(cmd), Path(cwd)))
         if cmd == ["git", "status", "--porcelain"]:
             return ""
+        if cmd == ["git", "symbolic-ref", "--short", "HEAD"]:
+            return "main\n"
         return "ok"
 
     monkeypatch.setattr(updater, "_run_git_command", fake_run)
 
     updater.update_repository(repo_dir, branch="main", force=False)
 
+    # Already on the requested branch, so no checkout is issued.
     assert executed == [
         (("git", "status", "--porcelain"), repo_dir),
+        (("git", "symbolic-ref", "--short", "HEAD"), repo_dir),
         (("git", "fetch", "origin", "main"), repo_dir),
-        (("git", "checkout", "main"), repo_dir),
-        (("git", "pull", "--ff-only", "origin", "main"), repo_dir),
+        (("git", "merge", "--ff-only", "FETCH_HEAD"), repo_dir),
+    ]
+
+
+def test_update_repository_checks_out_other_branch(tmp_path, monkeypatch):
+    repo_dir = tmp_path / "repo"
+    repo_dir.mkdir()
+    (repo_dir / ".git").mkdir()
+
+    _fake_git_available(monkeypatch)
+
+    executed = []
+
+    def fake_run(cmd, cwd):
+        executed.append(tuple(cmd))
+        if cmd == ["git", "status", "--porcelain"]:
+            return ""
+        if cmd == ["git", "symbolic-ref", "--short", "HEAD"]:
+            return "main\n"
+        return "ok"
+
+    monkeypatch.setattr(updater, "_run_git_command", fake_run)
+
+    updater.update_repository(repo_dir, branch="release", force=True)
+
+    assert executed == [
+        ("git", "status", "--porcelain"),
+        ("git", "symbolic-ref", "--short", "HEAD"),
+        ("git", "fetch", "origin", "release"),
+        ("git", "checkout", "release"),
+        ("git", "reset", "--hard", "FETCH_HEAD"),
     ]
 
 